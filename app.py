@@ -1,13 +1,16 @@
 import streamlit as st
+from streamlit.runtime.scriptrunner import get_script_run_ctx
 import requests
+from urllib.parse import urlencode
+from concurrent.futures import ThreadPoolExecutor
+import orjson
 import pandas as pd
 import plotly.express as px
 import plotly.graph_objects as go
 from datetime import datetime, timedelta
-from collections import Counter
+from collections import Counter, OrderedDict
 import time
 from wordcloud import WordCloud
-import matplotlib.pyplot as plt
 from reportlab.lib.pagesizes import letter, A4
 from reportlab.lib import colors
 from reportlab.lib.units import inch
@@ -17,6 +20,19 @@ from reportlab.lib.enums import TA_CENTER, TA_LEFT
 import io
 import tempfile
 import os
+import sys
+import json
+import logging
+import threading
+import zipfile
+import tracemalloc
+import re
+import zlib
+import hashlib
+import itertools
+import numpy as np
+from scipy import sparse
+from scipy.sparse.csgraph import connected_components
 
 # Page configuration
 st.set_page_config(
@@ -54,8 +70,6 @@ st.title("📊 NewsData.io Analysis Dashboard")
 st.markdown("### Advanced News Analytics with Sentiment Analysis & Visualizations")
 
 # Initialize session state
-if 'articles' not in st.session_state:
-    st.session_state.articles = []
 if 'total_results' not in st.session_state:
     st.session_state.total_results = 0
 if 'analysis_done' not in st.session_state:
@@ -64,6 +78,297 @@ if 'api_url' not in st.session_state:
     st.session_state.api_url = ""
 if 'api_params' not in st.session_state:
     st.session_state.api_params = {}
+if 'aggregates' not in st.session_state:
+    st.session_state.aggregates = None
+if 'fetch_stats' not in st.session_state:
+    st.session_state.fetch_stats = None
+if 'transport' not in st.session_state:
+    st.session_state.transport = None
+if 'replay_source' not in st.session_state:
+    st.session_state.replay_source = None
+
+# Article payloads live in a process-wide store rather than in session state,
+# so that idle sessions can be spilled to disk when memory runs short
+SESSION_MEMORY_BUDGET_MB = 200     # Largest payload a single session may keep resident
+GLOBAL_MEMORY_BUDGET_MB = 1000     # Total resident payload across all sessions
+SESSION_IDLE_TTL = 6 * 3600        # Seconds before an idle session's payload is dropped
+SPILL_DIR = os.path.join(tempfile.gettempdir(), "newsdata-dashboard-spill")
+MEMORY_LOCATION_LABELS = {
+    'memory': "in memory",
+    'active': "in memory while this session is active (over the per-session budget)",
+    'disk': "spilled to disk"
+}
+
+
+def deep_sizeof(obj):
+    """Approximate memory used by an article value, including nested containers"""
+    size = sys.getsizeof(obj)
+    if isinstance(obj, dict):
+        size += sum(deep_sizeof(k) + deep_sizeof(v) for k, v in obj.items())
+    elif isinstance(obj, (list, tuple, set)):
+        size += sum(deep_sizeof(v) for v in obj)
+    return size
+
+
+def estimate_payload_bytes(articles, sample_size=200):
+    """Estimate the memory used by a list of articles from a sample"""
+    if not articles:
+        return 0
+    step = max(len(articles) // sample_size, 1)
+    sample = articles[::step][:sample_size]
+    per_article = sum(deep_sizeof(a) for a in sample) / len(sample)
+    return int(per_article * len(articles)) + sys.getsizeof(articles)
+
+
+def write_columnar(path, articles):
+    """Write articles to a compressed file with one JSON array per field"""
+    fields = {}
+    for a in articles:
+        for key in a:
+            fields.setdefault(key, None)
+    
+    with zipfile.ZipFile(path, 'w', compression=zipfile.ZIP_DEFLATED, compresslevel=1) as archive:
+        archive.writestr('_rows.json', json.dumps(len(articles)))
+        for field in fields:
+            # Record which rows have the field so absent keys stay absent on reload
+            present = [i for i, a in enumerate(articles) if field in a]
+            column = {
+                'rows': None if len(present) == len(articles) else present,
+                'values': [articles[i][field] for i in present]
+            }
+            archive.writestr(f"{field}.json", json.dumps(column))
+
+
+def read_columnar(path):
+    """Read articles written by write_columnar"""
+    with zipfile.ZipFile(path) as archive:
+        n_rows = json.loads(archive.read('_rows.json'))
+        articles = [{} for _ in range(n_rows)]
+        for name in archive.namelist():
+            if name == '_rows.json':
+                continue
+            field = name[:-5]
+            column = json.loads(archive.read(name))
+            rows = column['rows'] if column['rows'] is not None else range(n_rows)
+            for i, value in zip(rows, column['values']):
+                articles[i][field] = value
+    return articles
+
+
+class SessionStore:
+    """Per-session article payloads with memory budgets and LRU spill-to-disk"""
+    
+    def __init__(self, session_budget, global_budget):
+        self.session_budget = session_budget
+        self.global_budget = global_budget
+        self.lock = threading.Lock()
+        self.entries = OrderedDict()  # Least recently used first
+        self.spills = 0
+        self.reloads = 0
+        os.makedirs(SPILL_DIR, exist_ok=True)
+    
+    # Bookkeeping happens under the lock; spill files are written, read and removed
+    # outside it so that one session's disk I/O never blocks the others
+    
+    def put(self, session_id, articles):
+        """Store a session's articles, replacing any previous payload"""
+        entry = None
+        if articles:
+            entry = {
+                'articles': articles,
+                'count': len(articles),
+                'bytes': estimate_payload_bytes(articles),
+                'path': None,
+                'last_access': time.time()
+            }
+        
+        with self.lock:
+            stale = self._discard(session_id)
+            spill = []
+            if entry:
+                self.entries[session_id] = entry
+                spill = self._enforce(session_id, stale)
+        
+        self._write_spills(spill)
+        self._remove_files(stale)
+    
+    def get(self, session_id):
+        """Return a session's articles, reloading them from disk if spilled"""
+        stale = []
+        with self.lock:
+            entry = self.entries.get(session_id)
+            if entry is None:
+                return []
+            entry['last_access'] = time.time()
+            self.entries.move_to_end(session_id)
+            
+            # A payload still being written out can be taken back as-is
+            if entry['articles'] is None and 'spilling' in entry:
+                entry['articles'] = entry['spilling']
+            articles, path = entry['articles'], entry['path']
+            spill = self._enforce(session_id, stale) if articles is not None else []
+        
+        self._write_spills(spill)
+        self._remove_files(stale)
+        if articles is not None:
+            return articles
+        
+        try:
+            articles = read_columnar(path)
+        except (OSError, ValueError, zipfile.BadZipFile):
+            return []
+        
+        with self.lock:
+            # Keep the reload only if the payload wasn't replaced in the meantime
+            spill = []
+            if self.entries.get(session_id) is entry:
+                self.reloads += 1
+                if entry['articles'] is None:
+                    entry['articles'] = articles
+                articles = entry['articles']
+                spill = self._enforce(session_id, stale)
+        
+        self._write_spills(spill)
+        self._remove_files(stale)
+        return articles
+    
+    def drop(self, session_id):
+        """Forget a session's articles"""
+        with self.lock:
+            stale = self._discard(session_id)
+        self._remove_files(stale)
+    
+    def stats(self):
+        """Resident and spilled session metrics"""
+        with self.lock:
+            resident = [e for e in self.entries.values() if e['articles'] is not None]
+            spilled = [e for e in self.entries.values() if e['articles'] is None]
+            return {
+                'resident_sessions': len(resident),
+                'spilled_sessions': len(spilled),
+                'resident_bytes': sum(e['bytes'] for e in resident),
+                'spilled_bytes': sum(e['bytes'] for e in spilled),
+                'spills': self.spills,
+                'reloads': self.reloads
+            }
+    
+    def location(self, session_id):
+        """Where a session's articles currently live: 'memory', 'active', 'disk' or None
+        
+        'active' means the payload is over the session budget and stays in memory
+        only until another session uses the store.
+        """
+        with self.lock:
+            entry = self.entries.get(session_id)
+            if entry is None:
+                return None
+            if entry['articles'] is None:
+                return 'disk'
+            return 'active' if entry['bytes'] > self.session_budget else 'memory'
+    
+    def _discard(self, session_id):
+        entry = self.entries.pop(session_id, None)
+        return [entry['path']] if entry and entry['path'] else []
+    
+    def _enforce(self, current, stale):
+        """Pick entries to spill and return them; expired spill files are added to stale"""
+        now = time.time()
+        for session_id in list(self.entries):
+            if session_id != current and now - self.entries[session_id]['last_access'] > SESSION_IDLE_TTL:
+                stale.extend(self._discard(session_id))
+        
+        # The most recently used session may keep an oversized payload between
+        # reruns; it is spilled as soon as another session uses the store
+        spill = []
+        resident = 0
+        for session_id, entry in self.entries.items():
+            if entry['articles'] is None:
+                continue
+            if session_id != current and entry['bytes'] > self.session_budget and 'spilling' not in entry:
+                spill.append(entry)
+            else:
+                resident += entry['bytes']
+        
+        for session_id, entry in self.entries.items():
+            if resident <= self.global_budget:
+                break
+            if (session_id != current and entry['articles'] is not None and 'spilling' not in entry
+                    and entry['bytes'] <= self.session_budget):
+                spill.append(entry)
+                resident -= entry['bytes']
+        
+        # Readers take the payload back from 'spilling' until the file is written
+        for entry in spill:
+            entry['spilling'] = entry['articles']
+            entry['articles'] = None
+            self.spills += 1
+        return spill
+    
+    def _write_spills(self, spill):
+        for entry in spill:
+            # Payloads aren't modified after put() (cluster tags are added before it),
+            # so an existing spill file is still valid
+            path = entry['path']
+            if path is None:
+                try:
+                    fd, path = tempfile.mkstemp(dir=SPILL_DIR, suffix='.zip')
+                    os.close(fd)
+                    write_columnar(path, entry['spilling'])
+                except Exception:
+                    # The caller may be another user's session, so keep the payload
+                    # resident and log rather than raise
+                    logging.getLogger(__name__).exception("Could not spill session articles to disk")
+                    with self.lock:
+                        if entry['articles'] is None:
+                            entry['articles'] = entry['spilling']
+                        del entry['spilling']
+                        self.spills -= 1
+                    if path is not None:
+                        self._remove_files([path])
+                    continue
+            
+            with self.lock:
+                entry['path'] = path
+                del entry['spilling']
+                orphaned = not any(e is entry for e in self.entries.values())
+            if orphaned:
+                self._remove_files([path])
+    
+    def _remove_files(self, paths):
+        for path in paths:
+            try:
+                os.remove(path)
+            except OSError:
+                pass
+
+
+@st.cache_resource
+def get_session_store():
+    """Create the article store once per server process"""
+    return SessionStore(SESSION_MEMORY_BUDGET_MB * 2 ** 20, GLOBAL_MEMORY_BUDGET_MB * 2 ** 20)
+
+
+def current_session_id():
+    """ID of the browser session running this script"""
+    ctx = get_script_run_ctx()
+    return ctx.session_id if ctx else "default"
+
+
+def get_session_articles():
+    """Articles fetched by the current session"""
+    return get_session_store().get(current_session_id())
+
+
+def set_session_articles(articles):
+    """Replace the current session's articles and invalidate derived aggregates
+    
+    Articles are tagged with their story cluster first; once stored they are never
+    modified, since another session may be writing them to a spill file.
+    """
+    if articles:
+        tag_story_clusters(articles)
+    get_session_store().put(current_session_id(), articles)
+    st.session_state.aggregates = None
 
 # Sidebar - API Configuration
 st.sidebar.header("🔑 API Configuration")
@@ -134,14 +439,15 @@ else:  # Archive
 
 # Reset button
 if st.sidebar.button("🔄 Reset All Filters"):
-    st.session_state.articles = []
+    set_session_articles([])
+    st.session_state.fetch_stats = None
     st.session_state.total_results = 0
     st.session_state.analysis_done = False
     st.rerun()
 
 
-def build_api_url(api_key, endpoint_type, next_page=None):
-    """Build API URL with parameters"""
+def build_filter_params(endpoint_type):
+    """Build endpoint URL and filter parameters (without API key or cursor)"""
     base_urls = {
         "Latest News": "https://newsdata.io/api/1/latest",
         "Crypto News": "https://newsdata.io/api/1/crypto",
@@ -149,7 +455,7 @@ def build_api_url(api_key, endpoint_type, next_page=None):
     }
     
     url = base_urls[endpoint_type]
-    params = {"apikey": api_key}
+    params = {}
     
     # Add filters
     if search_query:
@@ -168,7 +474,7 @@ def build_api_url(api_key, endpoint_type, next_page=None):
         params["domain"] = domain
     
     # Crypto specific
-    if endpoint_type == "Crypto News" and 'coin' in locals() and coin:
+    if endpoint_type == "Crypto News" and 'coin' in globals() and coin:
         params["coin"] = coin
     
     # Time range
@@ -178,6 +484,15 @@ def build_api_url(api_key, endpoint_type, next_page=None):
         params["from_date"] = from_date.strftime("%Y-%m-%d")
         params["to_date"] = to_date.strftime("%Y-%m-%d")
     
+    return url, params
+
+
+def build_api_url(api_key, endpoint_type, next_page=None):
+    """Build API URL with parameters"""
+    url, filter_params = build_filter_params(endpoint_type)
+    params = {"apikey": api_key}
+    params.update(filter_params)
+    
     # Pagination
     if next_page:
         params["page"] = next_page
@@ -203,52 +518,302 @@ def clean_keywords(keywords):
     return cleaned
 
 
-def fetch_all_news(api_key, endpoint_type, progress_bar, status_text):
-    """Fetch all news articles with pagination"""
-    articles = []
+SENTIMENT_FIELDS = ['positive', 'neutral', 'negative']
+
+
+def sentiment_value(stats, field):
+    """One sentiment score as a float, NaN if missing or not numeric"""
+    if not isinstance(stats, dict):
+        return np.nan
+    try:
+        return float(stats.get(field, 0))
+    except (TypeError, ValueError):
+        return np.nan
+
+
+def normalize_article(article):
+    """Coerce an article's sentiment scores to floats in place, keeping every other field
+    
+    All response fields are kept so that CSV/JSON downloads contain the full articles.
+    """
+    stats = article.get('sentiment_stats')
+    positive = sentiment_value(stats, 'positive')
+    article['sentiment_stats'] = None if positive != positive else {
+        field: sentiment_value(stats, field) for field in SENTIMENT_FIELDS
+    }
+    return article
+
+
+# Record / replay settings
+REPLAY_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), ".replays")
+REPLAY_MEMORY_BUDGET_MB = 100     # Recorded or replayed response bodies a session may hold
+
+
+def replay_key(url, params):
+    """Identify a request by endpoint, filters and cursor, ignoring the API key"""
+    items = sorted((k, str(v)) for k, v in params.items() if k != 'apikey')
+    return f"{url}?{urlencode(items)}"
+
+
+class ReplayResponse:
+    """A recorded response exposing the parts of requests.Response the dashboard uses"""
+    
+    def __init__(self, status_code, content):
+        self.status_code = status_code
+        self.content = content
+
+
+class ApiTransport:
+    """Sends API requests live, records them, or replays them from an archive"""
+    
+    def __init__(self, mode="Live", entries=None, use_timings=False):
+        self.mode = mode
+        self.entries = entries if entries is not None else {}
+        self.use_timings = use_timings
+        self.recorded_bytes = sum(len(e['content']) for e in self.entries.values())
+        self.skipped = 0
+        self.version = 0               # Bumped on every write to entries
+        self.archive = (None, b"")
+    
+    def get(self, url, params, timeout=30):
+        """GET an API URL according to the current mode"""
+        key = replay_key(url, params)
+        
+        if self.mode == "Replay":
+            entry = self.entries.get(key)
+            if entry is None:
+                raise KeyError(f"No recorded response for {key}")
+            if self.use_timings:
+                time.sleep(entry['elapsed'])
+            return ReplayResponse(entry['status_code'], entry['content'])
+        
+        started = time.perf_counter()
+        response = requests.get(url, params=params, timeout=timeout)
+        
+        if self.mode != "Record":
+            return response
+        
+        # Stop recording rather than hold more response bodies than the replay budget
+        previous = self.entries.get(key)
+        recorded_bytes = self.recorded_bytes - (len(previous['content']) if previous else 0) + len(response.content)
+        if recorded_bytes > REPLAY_MEMORY_BUDGET_MB * 2 ** 20:
+            self.skipped += 1
+        else:
+            self.recorded_bytes = recorded_bytes
+            self.version += 1
+            self.entries[key] = {
+                'url': url,
+                'params': {k: v for k, v in params.items() if k != 'apikey'},
+                'status_code': response.status_code,
+                'elapsed': time.perf_counter() - started,
+                'content': response.content
+            }
+        
+        return response
+    
+    def archive_bytes(self):
+        """The recording as a replay archive, rebuilt only when responses are recorded"""
+        if self.archive[0] != self.version:
+            self.archive = (self.version, write_replay_archive(self.entries))
+        return self.archive[1]
+    
+    def memory_bytes(self):
+        """Response bodies held, plus the cached archive built from them"""
+        return self.recorded_bytes + len(self.archive[1])
+
+
+def write_replay_archive(entries):
+    """Pack recorded responses into a zip archive"""
+    index = []
+    buffer = io.BytesIO()
+    with zipfile.ZipFile(buffer, 'w', compression=zipfile.ZIP_DEFLATED) as archive:
+        for i, (key, entry) in enumerate(entries.items()):
+            body = f"responses/{i:05d}.json"
+            archive.writestr(body, entry['content'])
+            index.append({
+                'key': key,
+                'url': entry['url'],
+                'params': entry['params'],
+                'status_code': entry['status_code'],
+                'elapsed': round(entry['elapsed'], 4),
+                'body': body
+            })
+        archive.writestr('index.json', orjson.dumps({
+            'version': 1,
+            'created': datetime.now().isoformat(timespec='seconds'),
+            'entries': index
+        }))
+    return buffer.getvalue()
+
+
+def read_replay_archive(data, max_bytes=REPLAY_MEMORY_BUDGET_MB * 2 ** 20):
+    """Unpack a replay archive into recorded responses keyed by request"""
+    entries = {}
+    with zipfile.ZipFile(io.BytesIO(data)) as archive:
+        body_bytes = sum(info.file_size for info in archive.infolist() if info.filename != 'index.json')
+        if body_bytes > max_bytes:
+            raise ValueError(
+                f"archive holds {body_bytes / 2 ** 20:,.1f} MB of responses, "
+                f"over the {max_bytes / 2 ** 20:,.0f} MB replay budget"
+            )
+        index = orjson.loads(archive.read('index.json'))
+        for item in index['entries']:
+            entries[item['key']] = {
+                'url': item['url'],
+                'params': item['params'],
+                'status_code': item['status_code'],
+                'elapsed': item['elapsed'],
+                'content': archive.read(item['body'])
+            }
+    return entries
+
+
+def list_replay_archives():
+    """List replay archives saved on this server"""
+    if not os.path.isdir(REPLAY_DIR):
+        return []
+    return sorted((f for f in os.listdir(REPLAY_DIR) if f.endswith('.zip')), reverse=True)
+
+
+def get_transport():
+    """The current session's API transport"""
+    return st.session_state.transport
+
+
+# Patterns for reading a raw page without decoding it. The API sends nextPage as the
+# last top-level key, so a match is only trusted when just the closing brace follows;
+# a nextPage key nested inside an article can't end the document.
+NEXT_PAGE_PATTERN = re.compile(rb'"nextPage"\s*:\s*(?:null|"((?:[^"\\]|\\.)*)")\s*\}\s*\Z')
+ERROR_STATUS_PATTERN = re.compile(rb'"status"\s*:\s*"error"')
+
+
+def peek_next_page(content):
+    """Read the nextPage cursor from a raw response without decoding the whole page"""
+    start = content.rfind(b'"nextPage"')
+    match = NEXT_PAGE_PATTERN.match(content, start) if start >= 0 else None
+    if match is None:
+        return orjson.loads(content).get("nextPage")
+    if match.group(1) is None:
+        return None
+    return orjson.loads(b'"' + match.group(1) + b'"')
+
+
+def process_page(content, progress):
+    """Decode, normalize and aggregate one page (runs on the fetch worker thread)
+    
+    The page gets its own aggregates, merged by the caller only once the whole page
+    has succeeded, so a failing page is never partly counted.
+    """
+    started = time.perf_counter()
+    results = orjson.loads(content).get("results") or []
+    records = [normalize_article(r) for r in results]
+    page_aggregates = update_aggregates(new_aggregates(), records)
+    progress['articles'] += len(records)
+    return records, page_aggregates, (started, time.perf_counter())
+
+
+def interval_overlap(first, second):
+    """Total time during which two sorted lists of non-overlapping intervals intersect"""
+    total = 0.0
+    i = j = 0
+    while i < len(first) and j < len(second):
+        start = max(first[i][0], second[j][0])
+        end = min(first[i][1], second[j][1])
+        if end > start:
+            total += end - start
+        if first[i][1] < second[j][1]:
+            i += 1
+        else:
+            j += 1
+    return total
+
+
+def fetch_all_news(api_key, endpoint_type, progress_bar, status_text, stats=None, aggregates=None,
+                   measure_memory=False):
+    """Fetch all news articles with pagination
+    
+    Pages have to be requested in cursor order, so the next request is sent as soon as
+    the cursor has been read from the raw response, while a worker thread decodes,
+    normalizes and aggregates the page just received.
+    """
     next_page = None
     page_count = 0
     max_pages = 50
-    
-    while page_count < max_pages:
-        page_count += 1
-        
-        try:
-            url, params = build_api_url(api_key, endpoint_type, next_page)
-            response = requests.get(url, params=params, timeout=30)
+    pending = []
+    progress = {'articles': 0}
+    network_intervals = []
+    processing_intervals = []
+    
+    if stats is None:
+        stats = {}
+    if aggregates is None:
+        aggregates = new_aggregates()
+    stats['bytes'] = 0
+    if measure_memory:
+        tracemalloc.start()
+    started = time.perf_counter()
+    
+    with ThreadPoolExecutor(max_workers=1) as worker:
+        while page_count < max_pages:
+            page_count += 1
             
-            # Rate limit check
-            if response.status_code == 429:
-                st.error("⚠️ Rate limit reached! Showing results from fetched articles.")
-                break
-            
-            data = response.json()
-            
-            if data.get("status") == "error":
-                st.error(f"API Error: {data.get('results', {}).get('message', 'Unknown error')}")
-                break
-            
-            results = data.get("results", [])
-            if results:
-                articles.extend(results)
-            
-            # Update progress
-            progress = min(page_count / max_pages, 1.0)
-            progress_bar.progress(progress)
-            status_text.text(f"Pages Fetched: {page_count} | Articles: {len(articles):,}")
-            
-            next_page = data.get("nextPage")
+            try:
+                url, params = build_api_url(api_key, endpoint_type, next_page)
+                request_started = time.perf_counter()
+                response = get_transport().get(url, params, timeout=30)
+                content = response.content
+                network_intervals.append((request_started, time.perf_counter()))
+                stats['bytes'] += len(content)
+                
+                # Rate limit check
+                if response.status_code == 429:
+                    st.error("⚠️ Rate limit reached! Showing results from fetched articles.")
+                    break
+                
+                if ERROR_STATUS_PATTERN.search(content):
+                    data = orjson.loads(content)
+                    st.error(f"API Error: {data.get('results', {}).get('message', 'Unknown error')}")
+                    break
+                
+                next_page = peek_next_page(content)
+                pending.append(worker.submit(process_page, content, progress))
+                
+                # Update progress
+                progress_bar.progress(min(page_count / max_pages, 1.0))
+                status_text.text(f"Pages Fetched: {page_count} | Articles: {progress['articles']:,}")
+                
+                if not next_page:
+                    break
+                
+                # Delay for archive endpoint (not needed when no request reaches the API)
+                if endpoint_type == "Archive News" and get_transport().mode != "Replay":
+                    time.sleep(1)
             
-            if not next_page:
+            except Exception as e:
+                st.error(f"Fetch Error: {str(e)}. Showing partial results.")
                 break
-            
-            # Delay for archive endpoint
-            if endpoint_type == "Archive News":
-                time.sleep(1)
         
-        except Exception as e:
-            st.error(f"Fetch Error: {str(e)}. Showing partial results.")
-            break
+        articles = []
+        for future in pending:
+            try:
+                records, page_aggregates, interval = future.result()
+            except Exception as e:
+                st.error(f"Decode Error: {str(e)}. Skipping page.")
+                continue
+            articles.extend(records)
+            merge_aggregates(aggregates, page_aggregates)
+            processing_intervals.append(interval)
+    
+    stats['wall_seconds'] = time.perf_counter() - started
+    stats['pages'] = page_count
+    stats['network_seconds'] = sum(end - start for start, end in network_intervals)
+    stats['processing_seconds'] = sum(end - start for start, end in processing_intervals)
+    # Share of page processing that ran while a request was in flight
+    hidden = interval_overlap(network_intervals, processing_intervals)
+    stats['overlap'] = hidden / stats['processing_seconds'] if stats['processing_seconds'] > 0 else 0.0
+    if measure_memory:
+        stats['peak_bytes'] = tracemalloc.get_traced_memory()[1]
+        tracemalloc.stop()
     
     status_text.text(f"✓ Complete! Pages: {page_count} | Articles: {len(articles):,}")
     progress_bar.progress(1.0)
@@ -256,40 +821,125 @@ def fetch_all_news(api_key, endpoint_type, progress_bar, status_text):
     return articles
 
 
-def generate_stats(articles):
-    """Generate statistics cards"""
-    col1, col2, col3, col4 = st.columns(4)
-    
-    unique_sources = len(set([a.get('source_id') for a in articles if a.get('source_id')]))
-    
-    avg_positive = 0
-    valid_count = 0
+def new_aggregates():
+    """Create an empty set of running aggregates"""
+    return {
+        'total': 0,
+        'source_counts': Counter(),
+        'source_id_counts': Counter(),
+        'sentiment_counts': Counter(),
+        'category_counts': Counter(),
+        'country_counts': Counter(),
+        'date_counts': Counter(),
+        'keyword_counts': Counter(),
+        'coin_counts': Counter(),
+        'coin_negative': Counter(),
+        # Scores are summed and counted per key, since any one of them can be missing
+        'sentiment_sums': {'positive': 0.0, 'neutral': 0.0, 'negative': 0.0},
+        'sentiment_score_counts': {'positive': 0, 'neutral': 0, 'negative': 0},
+        'sentiment_max': {'positive': None, 'neutral': None, 'negative': None},
+        'sentiment_min': {'positive': None, 'neutral': None, 'negative': None}
+    }
+
+
+def update_aggregates(aggregates, articles):
+    """Fold a batch of articles into running aggregates"""
     for a in articles:
+        aggregates['total'] += 1
+        aggregates['source_counts'][a.get('source_name', 'Unknown')] += 1
+        if a.get('source_id'):
+            aggregates['source_id_counts'][a['source_id']] += 1
+        
+        sentiment = a.get('sentiment', 'neutral') or 'neutral'
+        aggregates['sentiment_counts'][sentiment] += 1
+        
         if a.get('sentiment_stats'):
-            avg_positive += a['sentiment_stats'].get('positive', 0)
-            valid_count += 1
-    avg_positive = avg_positive / valid_count if valid_count > 0 else 0
-    
-    countries = []
-    for a in articles:
+            for key in aggregates['sentiment_sums']:
+                value = a['sentiment_stats'].get(key, 0)
+                if value != value:
+                    continue
+                aggregates['sentiment_sums'][key] += value
+                aggregates['sentiment_score_counts'][key] += 1
+                for bound, pick in (('sentiment_max', max), ('sentiment_min', min)):
+                    current = aggregates[bound][key]
+                    aggregates[bound][key] = value if current is None else pick(current, value)
+        
+        if a.get('category'):
+            aggregates['category_counts'].update(c for c in a['category'] if c)
         if a.get('country'):
-            countries.extend(a['country'])
-    unique_countries = len(set([c for c in countries if c]))
+            aggregates['country_counts'].update(c.upper() for c in a['country'] if c)
+        if a.get('pubDate'):
+            aggregates['date_counts'][a['pubDate'].split(' ')[0]] += 1
+        if a.get('keywords'):
+            aggregates['keyword_counts'].update(clean_keywords(a['keywords']))
+        
+        if a.get('coin'):
+            coins = set(str(c).strip().lower() for c in a['coin'] if c)
+            aggregates['coin_counts'].update(coins)
+            if sentiment == 'negative':
+                aggregates['coin_negative'].update(coins)
+    
+    return aggregates
+
+
+def merge_aggregates(aggregates, other):
+    """Fold one set of aggregates into another"""
+    aggregates['total'] += other['total']
+    for key, value in other.items():
+        if isinstance(value, Counter):
+            aggregates[key].update(value)
+    
+    for key in aggregates['sentiment_sums']:
+        aggregates['sentiment_sums'][key] += other['sentiment_sums'][key]
+        aggregates['sentiment_score_counts'][key] += other['sentiment_score_counts'][key]
+        for bound, pick in (('sentiment_max', max), ('sentiment_min', min)):
+            values = [v for v in (aggregates[bound][key], other[bound][key]) if v is not None]
+            aggregates[bound][key] = pick(values) if values else None
+    
+    return aggregates
+
+
+def compute_aggregates(articles):
+    """Compute aggregates for a full list of articles"""
+    return update_aggregates(new_aggregates(), articles)
+
+
+def aggregates_from_json(data):
+    """Restore aggregates loaded from JSON (Counters come back as plain dicts)
+    
+    Returns None when the stored aggregates lack fields added since they were saved.
+    """
+    aggregates = new_aggregates()
+    if not set(aggregates) <= set(data):
+        return None
+    for key, value in data.items():
+        if isinstance(aggregates.get(key), Counter):
+            aggregates[key] = Counter(value)
+        else:
+            aggregates[key] = value
+    return aggregates
+
+
+def generate_stats(aggregates):
+    """Generate statistics cards"""
+    col1, col2, col3, col4 = st.columns(4)
+    
+    valid_count = aggregates['sentiment_score_counts']['positive']
+    avg_positive = aggregates['sentiment_sums']['positive'] / valid_count if valid_count > 0 else 0
     
     with col1:
-        st.metric("📰 Articles Analyzed", f"{len(articles):,}")
+        st.metric("📰 Articles Analyzed", f"{aggregates['total']:,}")
     with col2:
-        st.metric("📡 Unique Sources", unique_sources)
+        st.metric("📡 Unique Sources", len(aggregates['source_id_counts']))
     with col3:
         st.metric("😊 Avg Positive Sentiment", f"{avg_positive:.1f}%")
     with col4:
-        st.metric("🌍 Countries Covered", unique_countries)
+        st.metric("🌍 Countries Covered", len(aggregates['country_counts']))
 
 
-def plot_source_chart(articles):
+def plot_source_chart(aggregates):
     """Plot news by source"""
-    source_counts = Counter([a.get('source_name', 'Unknown') for a in articles])
-    top_sources = dict(source_counts.most_common(10))
+    top_sources = dict(aggregates['source_counts'].most_common(10))
     
     fig = px.bar(
         x=list(top_sources.values()),
@@ -304,9 +954,9 @@ def plot_source_chart(articles):
     return fig
 
 
-def plot_sentiment_chart(articles):
+def plot_sentiment_chart(aggregates):
     """Plot sentiment distribution"""
-    sentiment_counts = Counter([a.get('sentiment', 'neutral') for a in articles])
+    sentiment_counts = aggregates['sentiment_counts']
     
     fig = px.pie(
         values=list(sentiment_counts.values()),
@@ -319,15 +969,9 @@ def plot_sentiment_chart(articles):
     return fig
 
 
-def plot_category_chart(articles):
+def plot_category_chart(aggregates):
     """Plot category distribution"""
-    categories = []
-    for a in articles:
-        if a.get('category'):
-            categories.extend(a['category'])
-    
-    category_counts = Counter(categories)
-    top_categories = dict(category_counts.most_common(8))
+    top_categories = dict(aggregates['category_counts'].most_common(8))
     
     fig = px.pie(
         values=list(top_categories.values()),
@@ -340,15 +984,9 @@ def plot_category_chart(articles):
     return fig
 
 
-def plot_country_chart(articles):
+def plot_country_chart(aggregates):
     """Plot country distribution"""
-    countries = []
-    for a in articles:
-        if a.get('country'):
-            countries.extend([c.upper() for c in a['country'] if c])
-    
-    country_counts = Counter(countries)
-    top_countries = dict(country_counts.most_common(10))
+    top_countries = dict(aggregates['country_counts'].most_common(10))
     
     fig = px.bar(
         x=list(top_countries.values()),
@@ -363,21 +1001,13 @@ def plot_country_chart(articles):
     return fig
 
 
-def plot_sentiment_scores(articles):
+def plot_sentiment_scores(aggregates):
     """Plot average sentiment scores"""
-    avg_scores = {'positive': 0, 'neutral': 0, 'negative': 0}
-    valid_count = 0
-    
-    for a in articles:
-        if a.get('sentiment_stats'):
-            avg_scores['positive'] += a['sentiment_stats'].get('positive', 0)
-            avg_scores['neutral'] += a['sentiment_stats'].get('neutral', 0)
-            avg_scores['negative'] += a['sentiment_stats'].get('negative', 0)
-            valid_count += 1
-    
-    if valid_count > 0:
-        for key in avg_scores:
-            avg_scores[key] /= valid_count
+    counts = aggregates['sentiment_score_counts']
+    avg_scores = {
+        key: total / counts[key] if counts[key] > 0 else 0
+        for key, total in aggregates['sentiment_sums'].items()
+    }
     
     fig = px.bar(
         x=['Positive', 'Neutral', 'Negative'],
@@ -392,16 +1022,9 @@ def plot_sentiment_scores(articles):
     return fig
 
 
-def plot_timeline(articles):
+def plot_timeline(aggregates):
     """Plot articles over time"""
-    dates = []
-    for a in articles:
-        if a.get('pubDate'):
-            date_str = a['pubDate'].split(' ')[0]
-            dates.append(date_str)
-    
-    date_counts = Counter(dates)
-    sorted_dates = sorted(date_counts.items())
+    sorted_dates = sorted(aggregates['date_counts'].items())
     
     if not sorted_dates:
         return None
@@ -422,70 +1045,456 @@ def plot_timeline(articles):
     return fig
 
 
-def generate_wordcloud(articles):
-    """Generate word cloud from keywords"""
-    all_keywords = []
-    for a in articles:
-        if a.get('keywords'):
-            cleaned = clean_keywords(a['keywords'])
-            all_keywords.extend(cleaned)
-    
-    if not all_keywords:
+# Word cloud settings
+WORDCLOUD_SIZE = (800, 400)
+WORDCLOUD_PREVIEW_SIZE = (320, 160)   # Laid out small, then drawn at full size via `scale`
+WORDCLOUD_PREVIEW_WORDS = 50       # The preview lays out only the most frequent keywords
+WORDCLOUD_CACHE_SIZE = 32          # Rendered images kept per server process
+
+
+def wordcloud_frequencies(keyword_counts, max_words=150):
+    """Top keywords seen more than once, as a hashable frequency table"""
+    return tuple((k, v) for k, v in keyword_counts.most_common(max_words) if v > 1)
+
+
+@st.cache_resource
+def get_wordcloud_cache():
+    """Rendered word clouds shared by all sessions, keyed by frequency table and size"""
+    return {'lock': threading.Lock(), 'images': OrderedDict()}
+
+
+def wordcloud_cache_key(frequencies, width, height, scale):
+    """Cache key for a word cloud layout"""
+    digest = hashlib.sha1(repr(frequencies).encode('utf-8')).hexdigest()
+    return digest, width, height, scale
+
+
+def is_wordcloud_cached(frequencies, width, height, scale=1):
+    """Check whether a word cloud has already been rendered"""
+    cache = get_wordcloud_cache()
+    with cache['lock']:
+        return wordcloud_cache_key(frequencies, width, height, scale) in cache['images']
+
+
+def generate_wordcloud(frequencies, width, height, scale=1):
+    """Generate word cloud PNG from keyword frequencies"""
+    if not frequencies:
         return None
     
-    # Count keywords
-    keyword_counts = Counter(all_keywords)
-    
-    # Filter out single occurrences
-    filtered_keywords = {k: v for k, v in keyword_counts.items() if v > 1}
-    
-    if not filtered_keywords:
-        return None
+    cache = get_wordcloud_cache()
+    key = wordcloud_cache_key(frequencies, width, height, scale)
+    with cache['lock']:
+        if key in cache['images']:
+            cache['images'].move_to_end(key)
+            return cache['images'][key]
     
     # Generate word cloud
     wordcloud = WordCloud(
-        width=800,
-        height=400,
+        width=width,
+        height=height,
         background_color='white',
         colormap='viridis',
         relative_scaling=0.5,
-        min_font_size=10
-    ).generate_from_frequencies(filtered_keywords)
+        min_font_size=max(width // 80, 4),
+        max_words=len(frequencies),
+        scale=scale
+    ).generate_from_frequencies(dict(frequencies))
     
-    return wordcloud
+    buffer = io.BytesIO()
+    wordcloud.to_image().save(buffer, format='PNG')
+    png = buffer.getvalue()
+    
+    with cache['lock']:
+        cache['images'][key] = png
+        while len(cache['images']) > WORDCLOUD_CACHE_SIZE:
+            cache['images'].popitem(last=False)
+    
+    return png
 
 
-def get_sentiment_summary(articles):
-    """Get detailed sentiment summary"""
-    sentiment_data = {
-        'positive': [],
-        'neutral': [],
-        'negative': []
+def get_session_aggregates(articles, view="all"):
+    """Aggregates for one view of the current article set, computed once per fetch"""
+    if st.session_state.aggregates is None:
+        st.session_state.aggregates = {}
+    if view not in st.session_state.aggregates:
+        st.session_state.aggregates[view] = compute_aggregates(articles)
+    return st.session_state.aggregates[view]
+
+
+def build_keyword_matrix(articles, min_count=2):
+    """Build a sparse binary article x keyword matrix from cleaned keywords"""
+    keyword_counts = Counter()
+    article_keywords = []
+    for a in articles:
+        keywords = set(kw for kw in clean_keywords(a.get('keywords')) if kw)
+        article_keywords.append(keywords)
+        keyword_counts.update(keywords)
+    
+    # Keywords seen fewer than min_count times can never form a kept edge
+    vocab = {kw: i for i, kw in enumerate(kw for kw, c in keyword_counts.items() if c >= min_count)}
+    
+    indices = []
+    indptr = [0]
+    for keywords in article_keywords:
+        indices.extend(vocab[kw] for kw in keywords if kw in vocab)
+        indptr.append(len(indices))
+    
+    matrix = sparse.csr_matrix(
+        (np.ones(len(indices), dtype=np.int32), np.array(indices, dtype=np.int32), np.array(indptr, dtype=np.int64)),
+        shape=(len(article_keywords), len(vocab))
+    )
+    return matrix, list(vocab)
+
+
+def compute_keyword_cooccurrence(articles):
+    """Compute keyword co-occurrence counts as a sparse keyword x keyword matrix"""
+    matrix, keywords = build_keyword_matrix(articles)
+    return {
+        'keywords': keywords,
+        'frequencies': np.asarray(matrix.sum(axis=0)).ravel(),
+        'cooccurrence': sparse.triu(matrix.T @ matrix, k=1).tocoo(),
+        'n_articles': matrix.shape[0]
     }
+
+
+def get_keyword_cooccurrence(articles, view="all"):
+    """Keyword co-occurrence for the current article set, cached with the aggregates"""
+    aggregates = get_session_aggregates(articles, view)
+    if 'keyword_cooccurrence' not in aggregates:
+        aggregates['keyword_cooccurrence'] = compute_keyword_cooccurrence(articles)
+    return aggregates['keyword_cooccurrence']
+
+
+def top_keyword_edges(cooccurrence, weighting="Count", top_k=75, min_count=2):
+    """Return the top-k keyword pairs by co-occurrence count or PMI"""
+    matrix = cooccurrence['cooccurrence']
+    mask = matrix.data >= min_count
+    rows, cols, counts = matrix.row[mask], matrix.col[mask], matrix.data[mask]
+    
+    if len(counts) == 0:
+        return []
+    
+    if weighting == "PMI":
+        frequencies = cooccurrence['frequencies'].astype(float)
+        weights = np.log(counts * float(cooccurrence['n_articles']) / (frequencies[rows] * frequencies[cols]))
+    else:
+        weights = counts.astype(float)
+    
+    if len(weights) > top_k:
+        top = np.argpartition(weights, -top_k)[-top_k:]
+    else:
+        top = np.arange(len(weights))
+    top = top[np.argsort(weights[top])[::-1]]
+    
+    keywords = cooccurrence['keywords']
+    return [(keywords[rows[i]], keywords[cols[i]], float(weights[i]), int(counts[i])) for i in top]
+
+
+def spring_layout(n_nodes, sources, targets, iterations=60, seed=42):
+    """Simple force-directed layout for a small graph"""
+    rng = np.random.default_rng(seed)
+    pos = rng.random((n_nodes, 2))
+    k = 1 / np.sqrt(n_nodes)
+    step = 0.1
+    
+    for _ in range(iterations):
+        delta = pos[:, None, :] - pos[None, :, :]
+        dist = np.maximum(np.linalg.norm(delta, axis=-1), 0.01)
+        disp = (delta * (k * k / dist ** 2)[..., None]).sum(axis=1)
+        
+        edge_delta = pos[sources] - pos[targets]
+        edge_dist = np.maximum(np.linalg.norm(edge_delta, axis=-1), 0.01)
+        pull = edge_delta * (edge_dist / k)[:, None]
+        np.add.at(disp, sources, -pull)
+        np.add.at(disp, targets, pull)
+        
+        length = np.maximum(np.linalg.norm(disp, axis=-1), 0.01)
+        pos += disp / length[:, None] * np.minimum(length, step)[:, None]
+        step *= 0.95
+    
+    return pos
+
+
+def plot_keyword_graph(edges, weighting="Count"):
+    """Plot keyword co-occurrence network"""
+    if not edges:
+        return None
+    
+    nodes = {}
+    for source, target, _, _ in edges:
+        nodes.setdefault(source, len(nodes))
+        nodes.setdefault(target, len(nodes))
+    
+    sources = np.array([nodes[e[0]] for e in edges])
+    targets = np.array([nodes[e[1]] for e in edges])
+    pos = spring_layout(len(nodes), sources, targets)
+    
+    strength = np.zeros(len(nodes))
+    np.add.at(strength, sources, [e[3] for e in edges])
+    np.add.at(strength, targets, [e[3] for e in edges])
+    
+    edge_x, edge_y = [], []
+    for s, t in zip(sources, targets):
+        edge_x.extend([pos[s, 0], pos[t, 0], None])
+        edge_y.extend([pos[s, 1], pos[t, 1], None])
+    
+    fig = go.Figure()
+    fig.add_trace(go.Scatter(
+        x=edge_x, y=edge_y, mode='lines',
+        line=dict(width=1, color='rgba(102, 126, 234, 0.4)'),
+        hoverinfo='none'
+    ))
+    fig.add_trace(go.Scatter(
+        x=pos[:, 0], y=pos[:, 1], mode='markers+text',
+        text=list(nodes), textposition='top center',
+        marker=dict(size=8 + 22 * np.sqrt(strength / strength.max()), color='#764ba2'),
+        hovertext=[f"{kw}: {int(s)} co-occurrences" for kw, s in zip(nodes, strength)],
+        hoverinfo='text'
+    ))
+    fig.update_layout(
+        title=f"🕸️ Keyword Co-occurrence Network (Top {len(edges)} pairs by {weighting})",
+        height=600, showlegend=False,
+        xaxis=dict(visible=False), yaxis=dict(visible=False)
+    )
+    
+    return fig
+
+
+def get_keyword_graph(articles, view="all", weighting="Count", top_k=75):
+    """Keyword network figure, cached with the aggregates for the current setting only"""
+    aggregates = get_session_aggregates(articles, view)
+    cached = aggregates.get('keyword_graph')
+    if cached is None or cached[0] != (weighting, top_k):
+        edges = top_keyword_edges(get_keyword_cooccurrence(articles, view), weighting, top_k)
+        cached = ((weighting, top_k), plot_keyword_graph(edges, weighting))
+        aggregates['keyword_graph'] = cached
+    return cached[1]
+
+
+# Near-duplicate detection settings
+MINHASH_PERMUTATIONS = 128
+LSH_BANDS = 32                     # 32 bands x 4 rows puts the LSH threshold near 0.42 Jaccard
+DUPLICATE_THRESHOLD = 0.6          # Estimated Jaccard needed to merge a candidate pair
+
+
+def article_shingles(article, size=3):
+    """Hash the word shingles of an article's title and description"""
+    text = f"{article.get('title') or ''} {article.get('description') or ''}".lower()
+    words = re.findall(r"\w+", text)
+    
+    if len(words) < size:
+        grams = [" ".join(words)] if words else []
+    else:
+        grams = (" ".join(words[i:i + size]) for i in range(len(words) - size + 1))
     
-    for article in articles:
-        if article.get('sentiment_stats'):
-            sentiment_data['positive'].append(article['sentiment_stats'].get('positive', 0))
-            sentiment_data['neutral'].append(article['sentiment_stats'].get('neutral', 0))
-            sentiment_data['negative'].append(article['sentiment_stats'].get('negative', 0))
+    return {zlib.crc32(g.encode('utf-8')) for g in grams}
+
+
+def minhash_signatures(shingle_sets, num_perm=MINHASH_PERMUTATIONS, seed=1):
+    """Compute MinHash signatures, one row per article"""
+    rng = np.random.default_rng(seed)
+    a = rng.integers(1, 2 ** 63, num_perm, dtype=np.uint64) | np.uint64(1)
+    b = rng.integers(0, 2 ** 63, num_perm, dtype=np.uint64)
+    
+    signatures = np.full((len(shingle_sets), num_perm), np.iinfo(np.uint32).max, dtype=np.uint32)
+    lengths = np.array([len(s) for s in shingle_sets], dtype=np.int64)
+    owners = np.nonzero(lengths)[0]
+    if len(owners) == 0:
+        return signatures
+    
+    shingles = np.fromiter(itertools.chain.from_iterable(shingle_sets), dtype=np.uint64, count=int(lengths.sum()))
+    starts = np.concatenate(([0], np.cumsum(lengths[owners])[:-1]))
+    
+    # Multiply-shift hashing, a few permutations at a time to bound memory
+    chunk = 16
+    for i in range(0, num_perm, chunk):
+        hashed = (shingles[:, None] * a[None, i:i + chunk] + b[None, i:i + chunk]) >> np.uint64(32)
+        signatures[owners, i:i + chunk] = np.minimum.reduceat(hashed, starts, axis=0)
+    
+    return signatures
+
+
+def cluster_near_duplicates(articles, bands=LSH_BANDS, threshold=DUPLICATE_THRESHOLD):
+    """Assign a cluster ID to each article, grouping near-duplicates via MinHash LSH"""
+    shingle_sets = [article_shingles(a) for a in articles]
+    signatures = minhash_signatures(shingle_sets)
+    has_text = np.array([bool(s) for s in shingle_sets], dtype=bool)
+    rows = signatures.shape[1] // bands
+    
+    sources, targets = [], []
+    
+    for band in range(bands):
+        block = np.ascontiguousarray(signatures[:, band * rows:(band + 1) * rows])
+        keys = block.view(np.dtype((np.void, block.dtype.itemsize * rows))).ravel()
+        _, bucket, counts = np.unique(keys, return_inverse=True, return_counts=True)
+        bucket = bucket.ravel()
+        
+        candidates = np.nonzero((counts[bucket] > 1) & has_text)[0]
+        if len(candidates) == 0:
+            continue
+        
+        # Compare each candidate with the first and the previous member of its bucket
+        # rather than all pairs; either match links it into the cluster
+        order = candidates[np.argsort(bucket[candidates], kind='stable')]
+        order_bucket = bucket[order]
+        is_first = np.concatenate(([True], order_bucket[1:] != order_bucket[:-1]))
+        leaders = order[np.maximum.accumulate(np.where(is_first, np.arange(len(order)), 0))]
+        previous = np.where(is_first, order, np.roll(order, 1))
+        
+        for others in (leaders, previous):
+            similar = (signatures[order] == signatures[others]).mean(axis=1) >= threshold
+            similar &= order != others
+            sources.append(order[similar])
+            targets.append(others[similar])
+    
+    n = len(articles)
+    if not sources:
+        return np.arange(n)
+    
+    sources = np.concatenate(sources)
+    targets = np.concatenate(targets)
+    graph = sparse.coo_matrix((np.ones(len(sources), dtype=np.int8), (sources, targets)), shape=(n, n))
+    _, cluster_ids = connected_components(graph, directed=False)
+    return cluster_ids
+
+
+def tag_story_clusters(articles):
+    """Tag each article with its near-duplicate cluster and the cluster's size"""
+    cluster_ids = cluster_near_duplicates(articles)
+    sizes = np.bincount(cluster_ids)
+    for article, cluster_id in zip(articles, cluster_ids):
+        article['cluster_id'] = int(cluster_id)
+        article['cluster_size'] = int(sizes[cluster_id])
+    return cluster_ids
+
+
+def collapse_duplicates(articles):
+    """Keep only the first article of each near-duplicate cluster"""
+    seen = set()
+    collapsed = []
+    for a in articles:
+        cluster_id = a.get('cluster_id')
+        if cluster_id not in seen:
+            seen.add(cluster_id)
+            collapsed.append(a)
+    return collapsed
+
+
+def top_syndicated_stories(articles, top_n=20):
+    """Summarize the most widely syndicated stories"""
+    clusters = {}
+    for a in articles:
+        clusters.setdefault(a.get('cluster_id'), []).append(a)
     
-    if not sentiment_data['positive']:
+    stories = sorted((c for c in clusters.values() if len(c) > 1), key=len, reverse=True)[:top_n]
+    if not stories:
         return None
     
+    rows = []
+    for members in stories:
+        dates = [a['pubDate'] for a in members if a.get('pubDate')]
+        sentiments = Counter(a.get('sentiment', 'neutral') or 'neutral' for a in members)
+        rows.append({
+            'Story': members[0].get('title', 'No Title'),
+            'Copies': len(members),
+            'Sources': len(set(a.get('source_id') for a in members if a.get('source_id'))),
+            'First Published': min(dates) if dates else '-',
+            'Sentiment': sentiments.most_common(1)[0][0]
+        })
+    
+    return pd.DataFrame(rows)
+
+
+def sentiment_score(article):
+    """Net sentiment score (positive minus negative), or NaN if unavailable"""
+    stats = article.get('sentiment_stats')
+    if isinstance(stats, dict):
+        return stats.get('positive', 0) - stats.get('negative', 0)
+    return np.nan
+
+
+def join_values(values):
+    """Format a list field for display"""
+    if isinstance(values, list):
+        return ", ".join(str(v) for v in values if v)
+    return values
+
+
+# Article browser columns and the sort keys they can be ordered by
+BROWSER_COLUMNS = {
+    'Title': lambda a: a.get('title'),
+    'Source': lambda a: a.get('source_name'),
+    'Published': lambda a: a.get('pubDate'),
+    'Sentiment': lambda a: a.get('sentiment'),
+    'Sentiment Score': sentiment_score,
+    'Country': lambda a: join_values(a.get('country')),
+    'Category': lambda a: join_values(a.get('category')),
+    'Description': lambda a: a.get('description'),
+    'Copies': lambda a: a.get('cluster_size'),
+    'Link': lambda a: a.get('link')
+}
+
+BROWSER_SORT_KEYS = {
+    'Published': lambda a: a.get('pubDate') or None,
+    'Sentiment Score': sentiment_score,
+    'Source': lambda a: (a.get('source_name') or '').lower() or None
+}
+
+
+def get_sort_index(articles, view, sort_by, descending):
+    """Row order for a sort key, computed once per article set and cached with the aggregates
+    
+    Ties keep their original order and articles missing the key go last in either direction.
+    """
+    aggregates = get_session_aggregates(articles, view)
+    indexes = aggregates.setdefault('sort_indexes', {})
+    
+    if (sort_by, descending) not in indexes:
+        values = [BROWSER_SORT_KEYS[sort_by](a) for a in articles]
+        missing = np.array([v is None or v != v for v in values], dtype=bool)
+        present = np.nonzero(~missing)[0]
+        
+        # Rank the values so both directions can use the same stable sort
+        ranks = np.unique(np.array([values[i] for i in present]), return_inverse=True)[1].ravel()
+        order = present[np.argsort(-ranks if descending else ranks, kind='stable')]
+        indexes[(sort_by, descending)] = np.concatenate((order, np.nonzero(missing)[0]))
+    
+    return indexes[(sort_by, descending)]
+
+
+def article_page(articles, order, page, page_size, columns):
+    """Build a DataFrame holding only the requested page of articles"""
+    rows = order[(page - 1) * page_size:page * page_size]
+    return pd.DataFrame(
+        [{c: BROWSER_COLUMNS[c](articles[i]) for c in columns} for i in rows],
+        columns=columns
+    )
+
+
+def get_sentiment_summary(aggregates):
+    """Get detailed sentiment summary"""
+    counts = aggregates['sentiment_score_counts']
+    if not any(counts.values()):
+        return None
+    
+    sums = aggregates['sentiment_sums']
+    maxima = aggregates['sentiment_max']
+    minima = aggregates['sentiment_min']
+    average = {key: sums[key] / counts[key] if counts[key] > 0 else 0 for key in sums}
     summary = {
-        'avg_positive': sum(sentiment_data['positive']) / len(sentiment_data['positive']),
-        'avg_neutral': sum(sentiment_data['neutral']) / len(sentiment_data['neutral']),
-        'avg_negative': sum(sentiment_data['negative']) / len(sentiment_data['negative']),
-        'max_positive': max(sentiment_data['positive']),
-        'max_negative': max(sentiment_data['negative']),
-        'min_positive': min(sentiment_data['positive']),
-        'min_negative': min(sentiment_data['negative'])
+        'avg_positive': average['positive'],
+        'avg_neutral': average['neutral'],
+        'avg_negative': average['negative'],
+        'max_positive': maxima['positive'] or 0,
+        'max_negative': maxima['negative'] or 0,
+        'min_positive': minima['positive'] or 0,
+        'min_negative': minima['negative'] or 0
     }
     
     return summary
 
 
-def export_to_pdf(articles, sentiment_summary):
+def export_to_pdf(aggregates, sentiment_summary):
     """Export analysis results to PDF"""
     buffer = io.BytesIO()
     doc = SimpleDocTemplate(buffer, pagesize=A4, rightMargin=30, leftMargin=30, topMargin=30, bottomMargin=18)
@@ -534,18 +1543,11 @@ def export_to_pdf(articles, sentiment_summary):
     # Summary Statistics
     elements.append(Paragraph("Summary Statistics", heading_style))
     
-    unique_sources = len(set([a.get('source_id') for a in articles if a.get('source_id')]))
-    countries = []
-    for a in articles:
-        if a.get('country'):
-            countries.extend(a['country'])
-    unique_countries = len(set([c for c in countries if c]))
-    
     stats_data = [
         ['Metric', 'Value'],
-        ['Total Articles Analyzed', f"{len(articles):,}"],
-        ['Unique Sources', str(unique_sources)],
-        ['Countries Covered', str(unique_countries)],
+        ['Total Articles Analyzed', f"{aggregates['total']:,}"],
+        ['Unique Sources', str(len(aggregates['source_id_counts']))],
+        ['Countries Covered', str(len(aggregates['country_counts']))],
     ]
     
     stats_table = Table(stats_data, colWidths=[3*inch, 2*inch])
@@ -597,8 +1599,7 @@ def export_to_pdf(articles, sentiment_summary):
     elements.append(PageBreak())
     elements.append(Paragraph("Top 10 News Sources", heading_style))
     
-    source_counts = Counter([a.get('source_name', 'Unknown') for a in articles])
-    top_sources = source_counts.most_common(10)
+    top_sources = aggregates['source_counts'].most_common(10)
     
     source_data = [['Rank', 'Source', 'Articles']]
     for idx, (source, count) in enumerate(top_sources, 1):
@@ -620,10 +1621,10 @@ def export_to_pdf(articles, sentiment_summary):
     elements.append(Spacer(1, 20))
     
     # Sentiment Distribution
-    sentiment_counts = Counter([a.get('sentiment', 'neutral') or 'neutral' for a in articles])
+    sentiment_counts = aggregates['sentiment_counts']
 
     sentiment_dist_data = [['Sentiment', 'Count', 'Percentage']]
-    total = len(articles)
+    total = aggregates['total']
     for sentiment, count in sentiment_counts.items():
         percentage = (count / total) * 100
         sentiment_name = str(sentiment).capitalize() if sentiment else 'Unknown'
@@ -658,6 +1659,573 @@ def export_to_pdf(articles, sentiment_summary):
     return buffer
 
 
+# Watchlist settings
+WATCHLIST_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), ".watchlists")
+WATCHLIST_MAX_ARTICLES = 5000      # Articles kept per watchlist for the dashboard
+WATCHLIST_MAX_SEEN_IDS = 20000     # Article IDs remembered for "new since last poll"
+WATCHLIST_MAX_POLL_PAGES = 5       # Upper bound on pages fetched per poll
+WATCHLIST_MAX_ALERTS = 50          # Alerts kept per watchlist
+WATCHLIST_BATCH_SIZE = 3           # Watchlists polled per scheduler tick
+WATCHLIST_STAGGER = 20             # Seconds between first polls of registered watchlists
+SCHEDULER_TICK = 5                 # Seconds between scheduler checks
+RATE_LIMIT_INTERVAL = 2            # Minimum seconds between any two scheduled requests
+WATCHLIST_RETRY_SECONDS = 300      # Back-off after a poll fails unexpectedly
+
+
+def watchlist_name(name):
+    """Normalize a watchlist name so it is safe to use as a file name"""
+    return "".join(c if c.isalnum() or c in "-_" else "_" for c in name.strip())
+
+
+def watchlist_path(name):
+    """Path of a watchlist's state file"""
+    return os.path.join(WATCHLIST_DIR, f"{name}.json")
+
+
+def watchlist_meta_path(name):
+    """Path of a watchlist's summary file, small enough to read on every rerun"""
+    return os.path.join(WATCHLIST_DIR, f"{name}.meta.json")
+
+
+def watchlist_owner(api_key):
+    """Identify a watchlist's owner by a hash of their API key"""
+    return hashlib.sha256(api_key.encode('utf-8')).hexdigest()[:16] if api_key else None
+
+
+def watchlist_exists(name):
+    """Check whether any user has a watchlist with this name"""
+    return os.path.exists(watchlist_path(name))
+
+
+def list_watchlists(owner):
+    """Summaries of the watchlists visible to an owner, keyed by name
+    
+    Watchlists saved before ownership was recorded are visible to everyone until
+    someone resumes polling them with their key.
+    """
+    if not os.path.isdir(WATCHLIST_DIR):
+        return {}
+    
+    summaries = {}
+    for f in sorted(os.listdir(WATCHLIST_DIR)):
+        if not f.endswith('.json') or f.endswith('.meta.json'):
+            continue
+        meta = load_watchlist_meta(f[:-5])
+        if meta is not None and meta['owner'] in (owner, None):
+            summaries[meta['name']] = meta
+    return summaries
+
+
+def new_watchlist(name, owner, endpoint_type, url, params, interval_minutes, negative_share, volume):
+    """Create the initial state of a watchlist"""
+    return {
+        'name': name,
+        'owner': owner,
+        'endpoint': endpoint_type,
+        'url': url,
+        'params': params,
+        'interval_minutes': interval_minutes,
+        'thresholds': {'negative_share': negative_share, 'volume': volume},
+        'created': datetime.now().isoformat(timespec='seconds'),
+        'last_poll': None,
+        'last_error': None,
+        'seen_ids': [],
+        'articles': [],
+        'aggregates': new_aggregates(),
+        'total_polled': 0,
+        'alerts': [],
+        'active_alerts': []
+    }
+
+
+def load_watchlist(name):
+    """Load a watchlist's state, or None if it does not exist"""
+    try:
+        with open(watchlist_path(name), encoding='utf-8') as f:
+            state = json.load(f)
+    except (OSError, ValueError):
+        return None
+    aggregates = aggregates_from_json(state.get('aggregates', {}))
+    if aggregates is None or aggregates['total'] != len(state['articles']):
+        aggregates = compute_aggregates(state['articles'])
+    state['aggregates'] = aggregates
+    state.setdefault('total_polled', aggregates['total'])
+    state.setdefault('owner', None)
+    return state
+
+
+def watchlist_meta(state):
+    """The parts of a watchlist's state shown in the sidebar"""
+    return {
+        'name': state['name'],
+        'owner': state.get('owner'),
+        'endpoint': state['endpoint'],
+        'interval_minutes': state['interval_minutes'],
+        'last_poll': state['last_poll'],
+        'last_error': state['last_error'],
+        'article_count': len(state['articles']),
+        'total_polled': state.get('total_polled', len(state['articles'])),
+        'alerts': state['alerts'][:5]
+    }
+
+
+def load_watchlist_meta(name):
+    """Load a watchlist's summary, rebuilding it from the full state if missing"""
+    try:
+        with open(watchlist_meta_path(name), encoding='utf-8') as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        pass
+    
+    # Watchlists saved before summaries existed get one written on first read
+    state = load_watchlist(name)
+    if state is None:
+        return None
+    meta = watchlist_meta(state)
+    try:
+        write_json_atomic(watchlist_meta_path(name), meta)
+    except OSError:
+        pass
+    return meta
+
+
+def write_json_atomic(path, data):
+    """Write JSON to a temporary file and move it into place"""
+    fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(path), suffix='.tmp')
+    with os.fdopen(fd, 'w', encoding='utf-8') as f:
+        json.dump(data, f)
+    os.replace(tmp_path, path)
+
+
+def save_watchlist(state):
+    """Atomically write a watchlist's state and summary to disk"""
+    os.makedirs(WATCHLIST_DIR, exist_ok=True)
+    write_json_atomic(watchlist_path(state['name']), state)
+    write_json_atomic(watchlist_meta_path(state['name']), watchlist_meta(state))
+
+
+def fetch_watchlist_updates(state, api_key, throttle):
+    """Fetch articles published since the watchlist's last poll"""
+    seen = set(state['seen_ids'])
+    new_articles = []
+    next_page = None
+    
+    for _ in range(WATCHLIST_MAX_POLL_PAGES):
+        params = dict(state['params'], apikey=api_key)
+        if next_page:
+            params["page"] = next_page
+        
+        throttle()
+        response = requests.get(state['url'], params=params, timeout=30)
+        
+        if response.status_code == 429:
+            raise RuntimeError("Rate limit reached")
+        
+        data = orjson.loads(response.content)
+        
+        if data.get("status") == "error":
+            raise RuntimeError(data.get('results', {}).get('message', 'Unknown error'))
+        
+        results = data.get("results", [])
+        fresh = [a for a in results if a.get('article_id') not in seen]
+        new_articles.extend(normalize_article(a) for a in fresh)
+        seen.update(a.get('article_id') for a in fresh)
+        
+        next_page = data.get("nextPage")
+        
+        # Results come newest first, so hitting a known article means we've caught up
+        if not next_page or len(fresh) < len(results):
+            break
+    
+    return new_articles
+
+
+def evaluate_watchlist_alerts(state, new_articles):
+    """Raise alerts for coins whose negative share or volume crossed a threshold"""
+    thresholds = state['thresholds']
+    batch = compute_aggregates(new_articles)
+    
+    groups = dict(batch['coin_counts'])
+    negatives = dict(batch['coin_negative'])
+    if not groups and batch['total']:
+        groups = {'(all)': batch['total']}
+        negatives = {'(all)': batch['sentiment_counts']['negative']}
+    
+    now = datetime.now().isoformat(timespec='seconds')
+    active = set()
+    alerts = []
+    
+    for coin, volume in groups.items():
+        share = negatives.get(coin, 0) / volume * 100
+        checks = [
+            ('negative_share', share, thresholds.get('negative_share')),
+            ('volume', volume, thresholds.get('volume'))
+        ]
+        for metric, value, threshold in checks:
+            if not threshold or value < threshold:
+                continue
+            key = f"{coin}:{metric}"
+            active.add(key)
+            # Only alert when crossing, not on every poll that stays above
+            if key not in state['active_alerts']:
+                alerts.append({
+                    'time': now,
+                    'coin': coin,
+                    'metric': metric,
+                    'value': round(value, 2),
+                    'threshold': threshold
+                })
+    
+    state['active_alerts'] = sorted(active)
+    state['alerts'] = (alerts + state['alerts'])[:WATCHLIST_MAX_ALERTS]
+    return alerts
+
+
+def apply_watchlist_poll(state, new_articles, error=None):
+    """Merge the result of a poll into a watchlist's state"""
+    state['last_poll'] = datetime.now().isoformat(timespec='seconds')
+    state['last_error'] = error
+    
+    if new_articles:
+        # Guard against a concurrent poll having stored some of these already
+        seen = set(state['seen_ids'])
+        new_articles = [a for a in new_articles if a.get('article_id') not in seen]
+    
+    # A failed or empty poll says nothing about whether a threshold is still crossed
+    if error or not new_articles:
+        return state
+    
+    new_ids = [a.get('article_id') for a in new_articles if a.get('article_id')]
+    state['seen_ids'] = (new_ids + state['seen_ids'])[:WATCHLIST_MAX_SEEN_IDS]
+    state['total_polled'] += len(new_articles)
+    
+    # Aggregates describe exactly the stored articles, so they can be opened as-is
+    articles = new_articles + state['articles']
+    if len(articles) > WATCHLIST_MAX_ARTICLES:
+        state['articles'] = articles[:WATCHLIST_MAX_ARTICLES]
+        state['aggregates'] = compute_aggregates(state['articles'])
+    else:
+        state['articles'] = articles
+        update_aggregates(state['aggregates'], new_articles)
+    
+    evaluate_watchlist_alerts(state, new_articles)
+    return state
+
+
+class WatchlistScheduler:
+    """Background thread that polls saved watchlists on their intervals"""
+    
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.api_keys = {}
+        self.sessions = {}
+        self.paused_sessions = set()
+        self.next_due = {}
+        self.last_request = 0.0
+        self.thread = threading.Thread(target=self._run, daemon=True)
+        self.thread.start()
+    
+    def register(self, name, api_key, session_id):
+        """Schedule a watchlist, staggering its first poll behind the others"""
+        with self.lock:
+            self.api_keys[name] = api_key
+            self.sessions[name] = session_id
+            if name not in self.next_due:
+                self.next_due[name] = time.time() + len(self.next_due) * WATCHLIST_STAGGER
+    
+    def set_paused(self, session_id, paused):
+        """Pause or resume the watchlists polling with a session's API key"""
+        with self.lock:
+            if paused:
+                self.paused_sessions.add(session_id)
+            else:
+                self.paused_sessions.discard(session_id)
+    
+    def is_scheduled(self, name):
+        """Check whether a watchlist has an API key to poll with"""
+        with self.lock:
+            return name in self.api_keys
+    
+    def save(self, state):
+        """Persist a watchlist without racing the polling thread"""
+        with self.lock:
+            save_watchlist(state)
+    
+    def claim(self, name, owner):
+        """Record the owner of a watchlist saved before ownership was tracked"""
+        with self.lock:
+            state = load_watchlist(name)
+            if state is not None and state['owner'] is None:
+                state['owner'] = owner
+                save_watchlist(state)
+    
+    def remove(self, name):
+        """Unschedule and delete a watchlist"""
+        with self.lock:
+            self.api_keys.pop(name, None)
+            self.sessions.pop(name, None)
+            self.next_due.pop(name, None)
+            for path in (watchlist_path(name), watchlist_meta_path(name)):
+                if os.path.exists(path):
+                    os.remove(path)
+    
+    def throttle(self):
+        """Keep scheduled requests at least RATE_LIMIT_INTERVAL apart"""
+        wait = self.last_request + RATE_LIMIT_INTERVAL - time.time()
+        if wait > 0:
+            time.sleep(wait)
+        self.last_request = time.time()
+    
+    def _run(self):
+        while True:
+            now = time.time()
+            with self.lock:
+                due = sorted(
+                    (t, name) for name, t in self.next_due.items()
+                    if t <= now and self.sessions.get(name) not in self.paused_sessions
+                )
+            
+            for _, name in due[:WATCHLIST_BATCH_SIZE]:
+                try:
+                    self._poll(name)
+                except Exception:
+                    # Keep the thread alive; retry this watchlist after a back-off
+                    with self.lock:
+                        if name in self.next_due:
+                            self.next_due[name] = time.time() + WATCHLIST_RETRY_SECONDS
+            
+            time.sleep(SCHEDULER_TICK)
+    
+    def _poll(self, name):
+        state = load_watchlist(name)
+        with self.lock:
+            api_key = self.api_keys.get(name)
+        
+        if state is None or not api_key:
+            with self.lock:
+                self.api_keys.pop(name, None)
+                self.sessions.pop(name, None)
+                self.next_due.pop(name, None)
+            return
+        
+        try:
+            new_articles = fetch_watchlist_updates(state, api_key, self.throttle)
+            error = None
+        except Exception as e:
+            new_articles, error = [], str(e)
+        
+        with self.lock:
+            # Reload so edits made while the request was in flight are kept
+            current = load_watchlist(name)
+            if current is None:
+                self.next_due.pop(name, None)
+                return
+            apply_watchlist_poll(current, new_articles, error)
+            save_watchlist(current)
+            self.next_due[name] = time.time() + current['interval_minutes'] * 60
+
+
+@st.cache_resource
+def get_watchlist_scheduler():
+    """Start the watchlist scheduler once per server process"""
+    return WatchlistScheduler()
+
+
+def open_watchlist(state):
+    """Load a watchlist's precomputed state into the dashboard"""
+    set_session_articles(state['articles'])
+    st.session_state.aggregates = {'all': state['aggregates']}
+    st.session_state.total_results = len(state['articles'])
+    st.session_state.analysis_done = True
+    st.session_state.api_url = state['url']
+    st.session_state.api_params = state['params']
+
+
+# Sidebar - Watchlists
+st.sidebar.header("📌 Watchlists")
+scheduler = get_watchlist_scheduler()
+owner = watchlist_owner(api_key)
+saved_watchlists = list_watchlists(owner)
+
+with st.sidebar.expander("Save current filters as watchlist"):
+    new_watchlist_name = st.text_input("Watchlist Name")
+    poll_interval = st.number_input("Poll Interval (minutes)", min_value=5, max_value=1440, value=30)
+    negative_threshold = st.slider(
+        "Alert: Negative Share (%)", 0, 100, 50,
+        help="Alert when a coin's share of negative articles in a poll reaches this (0 disables)"
+    )
+    volume_threshold = st.number_input(
+        "Alert: Articles per Poll", min_value=0, max_value=10000, value=0,
+        help="Alert when a coin's article count in a poll reaches this (0 disables)"
+    )
+    
+    if st.button("💾 Save Watchlist"):
+        name = watchlist_name(new_watchlist_name)
+        if not api_key:
+            st.error("Enter your API key first.")
+        elif not name:
+            st.error("Enter a watchlist name.")
+        elif watchlist_exists(name):
+            # Saving over a watchlist would wipe its articles, alerts and seen IDs
+            st.error(f"A watchlist named '{name}' already exists. Choose another name or delete it first.")
+        else:
+            url, params = build_filter_params(endpoint)
+            scheduler.save(new_watchlist(
+                name, owner, endpoint, url, params, int(poll_interval),
+                negative_threshold, int(volume_threshold)
+            ))
+            scheduler.register(name, api_key, current_session_id())
+            st.success(f"Saved watchlist '{name}'.")
+            saved_watchlists = list_watchlists(owner)
+
+if saved_watchlists:
+    selected_watchlist = st.sidebar.selectbox("Saved Watchlists", list(saved_watchlists))
+    watchlist_summary = saved_watchlists[selected_watchlist]
+    
+    st.sidebar.caption(
+        f"{watchlist_summary['endpoint']} | every {watchlist_summary['interval_minutes']} min | "
+        f"last poll: {watchlist_summary['last_poll'] or 'pending'} | "
+        f"articles: {watchlist_summary['article_count']:,} "
+        f"({watchlist_summary['total_polled']:,} polled)"
+    )
+    if watchlist_summary['last_error']:
+        st.sidebar.error(f"Last poll failed: {watchlist_summary['last_error']}")
+    for alert in watchlist_summary['alerts']:
+        label = "negative share" if alert['metric'] == 'negative_share' else "volume"
+        st.sidebar.warning(
+            f"🚨 {alert['time']} | {alert['coin']} {label} "
+            f"{alert['value']} ≥ {alert['threshold']}"
+        )
+    
+    # Watchlists poll with the key of whoever saved or resumed them, never
+    # with the key of another visitor
+    if not scheduler.is_scheduled(selected_watchlist):
+        st.sidebar.info("Polling is paused for this watchlist.")
+        if api_key and st.sidebar.button("▶️ Resume Polling With My API Key"):
+            scheduler.claim(selected_watchlist, owner)
+            scheduler.register(selected_watchlist, api_key, current_session_id())
+            st.rerun()
+    
+    col1, col2 = st.sidebar.columns(2)
+    with col1:
+        if st.button("📂 Open", use_container_width=True):
+            watchlist_state = load_watchlist(selected_watchlist)
+            if watchlist_state:
+                open_watchlist(watchlist_state)
+                st.rerun()
+    with col2:
+        if st.button("🗑️ Delete", use_container_width=True):
+            scheduler.remove(selected_watchlist)
+            st.rerun()
+elif not api_key:
+    st.sidebar.caption("Enter your API key to see your watchlists.")
+
+
+# Sidebar - Memory
+with st.sidebar.expander("🧠 Memory"):
+    memory_stats = get_session_store().stats()
+    st.write(
+        f"**Resident sessions:** {memory_stats['resident_sessions']} "
+        f"({memory_stats['resident_bytes'] / 2 ** 20:,.1f} / {GLOBAL_MEMORY_BUDGET_MB:,} MB)"
+    )
+    st.write(
+        f"**Spilled sessions:** {memory_stats['spilled_sessions']} "
+        f"({memory_stats['spilled_bytes'] / 2 ** 20:,.1f} MB on disk)"
+    )
+    st.write(f"**Spills / reloads:** {memory_stats['spills']} / {memory_stats['reloads']}")
+    session_location = get_session_store().location(current_session_id())
+    if session_location:
+        st.caption("This session's articles are " + MEMORY_LOCATION_LABELS[session_location] + ".")
+    transport = st.session_state.transport
+    if transport is not None and transport.mode in ("Record", "Replay") and transport.entries:
+        st.caption(f"Recorded responses hold {transport.memory_bytes() / 2 ** 20:,.1f} MB.")
+
+
+# Sidebar - Record / Replay
+st.sidebar.header("🎞️ Record / Replay")
+api_mode = st.sidebar.radio(
+    "API Mode",
+    ["Live", "Record", "Replay"],
+    horizontal=True,
+    help="Record captures API responses (without your API key); Replay runs the dashboard from a recording with no network"
+)
+
+# Watchlists poll outside the transport, so this session's ones are paused while replaying
+scheduler.set_paused(current_session_id(), api_mode == "Replay")
+
+if api_mode == "Live":
+    if st.session_state.transport is None or st.session_state.transport.mode != "Live":
+        st.session_state.transport = ApiTransport()
+
+elif api_mode == "Record":
+    if st.session_state.transport is None or st.session_state.transport.mode != "Record":
+        st.session_state.transport = ApiTransport("Record")
+    
+    transport = st.session_state.transport
+    st.sidebar.caption(
+        f"{len(transport.entries)} responses recorded "
+        f"({transport.recorded_bytes / 2 ** 20:,.1f} / {REPLAY_MEMORY_BUDGET_MB:,} MB)"
+    )
+    if transport.skipped:
+        st.sidebar.warning(f"Recording is full; {transport.skipped} later responses were not recorded.")
+    
+    if transport.entries:
+        archive_data = transport.archive_bytes()
+        archive_name = f"newsdata_replay_{datetime.now().strftime('%Y%m%d_%H%M%S')}.zip"
+        st.sidebar.download_button(
+            label="📥 Download Replay Archive",
+            data=archive_data,
+            file_name=archive_name,
+            mime="application/zip"
+        )
+        if st.sidebar.button("💾 Save Recording"):
+            os.makedirs(REPLAY_DIR, exist_ok=True)
+            with open(os.path.join(REPLAY_DIR, archive_name), 'wb') as f:
+                f.write(archive_data)
+            st.sidebar.success(f"Saved {archive_name}")
+
+else:  # Replay
+    uploaded_archive = st.sidebar.file_uploader("Replay Archive", type=["zip"])
+    saved_archives = list_replay_archives()
+    selected_archive = None
+    if uploaded_archive is None and saved_archives:
+        selected_archive = st.sidebar.selectbox("Saved Recordings", saved_archives)
+    use_timings = st.sidebar.checkbox("Replay original network timings")
+    
+    if uploaded_archive is not None:
+        replay_source = ('upload', uploaded_archive.name, uploaded_archive.size)
+    elif selected_archive:
+        replay_source = ('saved', selected_archive)
+    else:
+        replay_source = None
+    
+    if replay_source is None:
+        st.sidebar.info("Upload or record an archive to replay.")
+        st.session_state.transport = ApiTransport("Replay")
+    elif replay_source != st.session_state.replay_source or st.session_state.transport.mode != "Replay":
+        try:
+            if uploaded_archive is not None:
+                archive_data = uploaded_archive.getvalue()
+            else:
+                with open(os.path.join(REPLAY_DIR, selected_archive), 'rb') as f:
+                    archive_data = f.read()
+            st.session_state.transport = ApiTransport("Replay", read_replay_archive(archive_data))
+            st.session_state.replay_source = replay_source
+        except Exception as e:
+            st.sidebar.error(f"Could not read replay archive: {str(e)}")
+            st.session_state.transport = ApiTransport("Replay")
+            st.session_state.replay_source = None
+    
+    st.session_state.transport.use_timings = use_timings
+    st.sidebar.caption(f"{len(st.session_state.transport.entries)} recorded responses loaded")
+    
+    st.sidebar.caption("Watchlists polling with this session's API key are paused during replay.")
+    
+    # Recorded requests carry no API key, so none is needed to replay them
+    if not api_key:
+        api_key = "replay"
+
+
 # Main content area
 if not api_key:
     st.warning("⚠️ Please enter your NewsData.io API key in the sidebar to get started.")
@@ -676,14 +2244,15 @@ else:
     
     # Handle search
     if search_clicked:
-        st.session_state.articles = []
+        set_session_articles([])
+        st.session_state.fetch_stats = None
         st.session_state.analysis_done = False
         
         try:
             with st.spinner("Fetching initial results..."):
                 url, params = build_api_url(api_key, endpoint)
-                response = requests.get(url, params=params, timeout=30)
-                data = response.json()
+                response = get_transport().get(url, params, timeout=30)
+                data = orjson.loads(response.content)
                 
                 if data.get("status") == "error":
                     st.error(f"API Error: {data.get('results', {}).get('message', 'Unknown error')}")
@@ -705,6 +2274,11 @@ else:
             for key, value in st.session_state.api_params.items():
                 st.write(f"• **{key}:** {value}")
         
+        measure_memory = st.checkbox(
+            "Measure peak memory during fetch",
+            help="Tracks allocations with tracemalloc, which slows decoding down"
+        )
+        
         if st.button("📊 Generate Analysis", use_container_width=False):
             st.session_state.analysis_done = False
             
@@ -714,27 +2288,66 @@ else:
             status_text = st.empty()
             
             # Fetch all articles
-            articles = fetch_all_news(api_key, endpoint, progress_bar, status_text)
-            st.session_state.articles = articles
+            fetch_stats = {}
+            fetch_aggregates = new_aggregates()
+            articles = fetch_all_news(
+                api_key, endpoint, progress_bar, status_text,
+                stats=fetch_stats, aggregates=fetch_aggregates, measure_memory=measure_memory
+            )
+            set_session_articles(articles)
+            # Aggregates were built page by page during the fetch
+            st.session_state.aggregates = {'all': fetch_aggregates}
+            st.session_state.fetch_stats = fetch_stats
             st.session_state.analysis_done = True
             
             st.success(f"✅ Analysis complete! Fetched **{len(articles):,}** articles.")
+        
+        if st.session_state.fetch_stats:
+            with st.expander("⏱️ Fetch Performance", expanded=False):
+                fetch_stats = st.session_state.fetch_stats
+                col1, col2, col3, col4, col5 = st.columns(5)
+                with col1:
+                    st.metric("Total Time", f"{fetch_stats['wall_seconds']:.2f}s")
+                with col2:
+                    st.metric("Network", f"{fetch_stats['network_seconds']:.2f}s")
+                with col3:
+                    st.metric("Processing", f"{fetch_stats['processing_seconds']:.3f}s")
+                with col4:
+                    st.metric(
+                        "Overlap", f"{fetch_stats['overlap']:.0%}",
+                        help="Share of decoding and aggregation hidden behind network requests"
+                    )
+                with col5:
+                    if 'peak_bytes' in fetch_stats:
+                        st.metric("Peak Memory", f"{fetch_stats['peak_bytes'] / 2 ** 20:,.1f} MB")
+                    else:
+                        st.metric("Payload", f"{fetch_stats['bytes'] / 2 ** 20:,.1f} MB")
     
     # Display analysis
-    if st.session_state.analysis_done and st.session_state.articles:
-        articles = st.session_state.articles
+    all_articles = get_session_articles() if st.session_state.analysis_done else []
+    if all_articles:
+        articles = all_articles
         
         st.markdown("---")
         st.markdown("## 📊 Analysis Results")
         
+        collapse = st.checkbox(
+            "🧬 Collapse duplicate stories",
+            help="Count syndicated copies of the same story once in all statistics, charts and exports"
+        )
+        view = "collapsed" if collapse else "all"
+        if collapse:
+            articles = collapse_duplicates(articles)
+        aggregates = get_session_aggregates(articles, view)
+        
         # Statistics
-        generate_stats(articles)
+        generate_stats(aggregates)
         
         st.markdown("---")
         
         # Sentiment Analysis Results
         st.markdown("### 😊 Detailed Sentiment Analysis")
-        sentiment_summary = get_sentiment_summary(articles)
+        sentiment_summary = get_sentiment_summary(aggregates)
         
         if sentiment_summary:
             col1, col2, col3 = st.columns(3)
@@ -785,34 +2398,66 @@ else:
         
         # Word Cloud
         st.markdown("### ☁️ Keywords Word Cloud")
-        wordcloud = generate_wordcloud(articles)
+        wordcloud_max_words = st.slider("Max Keywords", 25, 500, 150, step=25)
+        frequencies = wordcloud_frequencies(aggregates['keyword_counts'], wordcloud_max_words)
         
-        if wordcloud:
-            fig, ax = plt.subplots(figsize=(12, 6))
-            ax.imshow(wordcloud, interpolation='bilinear')
-            ax.axis('off')
-            st.pyplot(fig)
+        if frequencies:
+            wordcloud_image = st.empty()
+            # Show a quick low-resolution layout while the full one renders
+            if not is_wordcloud_cached(frequencies, *WORDCLOUD_SIZE):
+                preview_scale = WORDCLOUD_SIZE[0] / WORDCLOUD_PREVIEW_SIZE[0]
+                wordcloud_image.image(generate_wordcloud(
+                    frequencies[:WORDCLOUD_PREVIEW_WORDS], *WORDCLOUD_PREVIEW_SIZE, scale=preview_scale
+                ))
+            wordcloud_image.image(generate_wordcloud(frequencies, *WORDCLOUD_SIZE))
         else:
             st.info("No valid keywords found for word cloud generation.")
         
         st.markdown("---")
         
+        # Keyword co-occurrence network
+        st.markdown("### 🕸️ Keyword Co-occurrence Network")
+        col1, col2 = st.columns([1, 3])
+        with col1:
+            graph_weighting = st.radio("Edge Weight", ["Count", "PMI"], horizontal=True)
+        with col2:
+            graph_top_k = st.slider("Keyword Pairs Shown", 10, 300, 75)
+        
+        keyword_graph = get_keyword_graph(articles, view, graph_weighting, graph_top_k)
+        
+        if keyword_graph:
+            st.plotly_chart(keyword_graph, use_container_width=True)
+        else:
+            st.info("No keywords appear together often enough to build a network.")
+        
+        st.markdown("---")
+        
         # Charts
         col1, col2 = st.columns(2)
         
         with col1:
-            st.plotly_chart(plot_source_chart(articles), use_container_width=True)
-            st.plotly_chart(plot_category_chart(articles), use_container_width=True)
-            st.plotly_chart(plot_sentiment_scores(articles), use_container_width=True)
+            st.plotly_chart(plot_source_chart(aggregates), use_container_width=True)
+            st.plotly_chart(plot_category_chart(aggregates), use_container_width=True)
+            st.plotly_chart(plot_sentiment_scores(aggregates), use_container_width=True)
         
         with col2:
-            st.plotly_chart(plot_sentiment_chart(articles), use_container_width=True)
-            st.plotly_chart(plot_country_chart(articles), use_container_width=True)
+            st.plotly_chart(plot_sentiment_chart(aggregates), use_container_width=True)
+            st.plotly_chart(plot_country_chart(aggregates), use_container_width=True)
             
-            timeline_fig = plot_timeline(articles)
+            timeline_fig = plot_timeline(aggregates)
             if timeline_fig:
                 st.plotly_chart(timeline_fig, use_container_width=True)
         
+        # Syndication
+        st.markdown("---")
+        st.markdown("### 🔁 Top Stories by Syndication")
+        syndicated = top_syndicated_stories(all_articles)
+        
+        if syndicated is not None:
+            st.dataframe(syndicated, use_container_width=True, hide_index=True)
+        else:
+            st.info("No syndicated stories found.")
+        
         # Download data
         st.markdown("---")
         st.markdown("### 💾 Download Data")
@@ -841,7 +2486,7 @@ else:
         
         with col3:
             # PDF Export
-            pdf_buffer = export_to_pdf(articles, sentiment_summary)
+            pdf_buffer = export_to_pdf(aggregates, sentiment_summary)
             st.download_button(
                 label="📄 Download PDF Report",
                 data=pdf_buffer,
@@ -851,18 +2496,39 @@ else:
         
         # Show sample articles
         st.markdown("---")
-        st.markdown("### 📰 Sample Articles")
-        
-        if st.checkbox("Show sample articles (first 10)"):
-            for i, article in enumerate(articles[:10], 1):
-                with st.expander(f"{i}. {article.get('title', 'No Title')}"):
-                    st.write(f"**Source:** {article.get('source_name', 'Unknown')}")
-                    st.write(f"**Published:** {article.get('pubDate', 'Unknown')}")
-                    st.write(f"**Sentiment:** {article.get('sentiment', 'Unknown')}")
-                    if article.get('description'):
-                        st.write(f"**Description:** {article['description']}")
-                    if article.get('link'):
-                        st.write(f"**[Read Full Article]({article['link']})**")
+        st.markdown("### 📰 Article Browser")
+        
+        col1, col2, col3, col4 = st.columns(4)
+        with col1:
+            sort_by = st.selectbox("Sort By", list(BROWSER_SORT_KEYS))
+        with col2:
+            sort_order = st.radio("Order", ["Descending", "Ascending"], horizontal=True)
+        with col3:
+            page_size = st.selectbox("Rows per Page", [25, 50, 100, 250])
+        
+        page_count = max((len(articles) + page_size - 1) // page_size, 1)
+        with col4:
+            page = st.number_input(f"Page (of {page_count:,})", min_value=1, max_value=page_count, value=1)
+        
+        browser_columns = st.multiselect(
+            "Columns",
+            list(BROWSER_COLUMNS),
+            default=['Title', 'Source', 'Published', 'Sentiment', 'Sentiment Score', 'Link']
+        )
+        
+        if browser_columns:
+            order = get_sort_index(articles, view, sort_by, sort_order == "Descending")
+            page_df = article_page(articles, order, int(page), page_size, browser_columns)
+            st.dataframe(
+                page_df,
+                use_container_width=True,
+                hide_index=True,
+                column_config={'Link': st.column_config.LinkColumn('Link')}
+            )
+            first_row = (int(page) - 1) * page_size
+            st.caption(f"Showing {first_row + 1:,}–{first_row + len(page_df):,} of {len(articles):,} articles")
+        else:
+            st.info("Select at least one column to browse articles.")
 
 # Footer
 st.markdown("---")
@@ -0,0 +1,125 @@
+"""
+Benchmark page decoding: the baseline response.json() path vs. the orjson path in app.py
+
+Usage:
+    python bench_decode.py [pages] [articles_per_page]
+
+Pages are synthetic but shaped like NewsData.io responses, including the long
+fields (content, description, image_url) that dominate payload size.
+"""
+
+import ast
+import json
+import os
+import random
+import sys
+import time
+import tracemalloc
+
+import numpy as np
+import orjson
+
+APP_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "app.py")
+
+
+def load_app_functions(*names):
+    """Load top-level definitions from app.py without running the Streamlit script"""
+    with open(APP_PATH, encoding='utf-8') as f:
+        tree = ast.parse(f.read())
+
+    wanted = set(names)
+    body = []
+    for node in tree.body:
+        if isinstance(node, ast.FunctionDef) and node.name in wanted:
+            body.append(node)
+        elif isinstance(node, ast.Assign) and any(getattr(t, 'id', None) in wanted for t in node.targets):
+            body.append(node)
+
+    namespace = {'np': np, 'orjson': orjson}
+    exec(compile(ast.Module(body=body, type_ignores=[]), APP_PATH, 'exec'), namespace)
+    return namespace
+
+
+def make_page(page, size, rng):
+    """One synthetic API page as raw JSON bytes"""
+    words = ["bitcoin", "market", "rally", "ethereum", "price", "token", "exchange", "regulator", "fund", "trade"]
+    results = []
+    for i in range(size):
+        text = " ".join(rng.choice(words) for _ in range(300))
+        results.append({
+            'article_id': f"{page}-{i}",
+            'title': " ".join(rng.choice(words) for _ in range(10)),
+            'link': f"https://example.com/{page}/{i}",
+            'keywords': [rng.choice(words) for _ in range(5)],
+            'creator': ["Staff Writer"],
+            'video_url': None,
+            'description': text[:400],
+            'content': text,
+            'pubDate': f"2026-10-{1 + i % 28:02d} 12:00:00",
+            'pubDateTZ': "UTC",
+            'image_url': f"https://example.com/img/{page}/{i}.jpg",
+            'source_id': f"source{i % 40}",
+            'source_name': f"Source {i % 40}",
+            'source_priority': 1000 + i,
+            'source_url': "https://example.com",
+            'language': "english",
+            'country': ["united states of america"],
+            'category': ["business"],
+            'coin': ["btc"],
+            'sentiment': rng.choice(["positive", "neutral", "negative"]),
+            'sentiment_stats': {'positive': rng.random() * 100, 'neutral': rng.random() * 100,
+                                'negative': None if i % 50 == 0 else rng.random() * 100},
+            'duplicate': False
+        })
+    return json.dumps({'status': 'success', 'totalResults': size, 'results': results,
+                       'nextPage': str(page + 1)}).encode('utf-8')
+
+
+def decode_all(decode, pages):
+    """Decode every page, keeping all articles"""
+    articles = []
+    for content in pages:
+        articles.extend(decode(content))
+    return articles
+
+
+def run(decode, pages, repeats=7):
+    """Best time over a few runs, then peak memory of a separate traced run"""
+    elapsed = float('inf')
+    for _ in range(repeats):
+        started = time.perf_counter()
+        articles = decode_all(decode, pages)
+        elapsed = min(elapsed, time.perf_counter() - started)
+        del articles
+
+    tracemalloc.start()
+    articles = decode_all(decode, pages)
+    peak = tracemalloc.get_traced_memory()[1] / 2 ** 20
+    tracemalloc.stop()
+    return elapsed, peak, len(articles)
+
+
+def main():
+    n_pages = int(sys.argv[1]) if len(sys.argv) > 1 else 500
+    page_size = int(sys.argv[2]) if len(sys.argv) > 2 else 10
+
+    rng = random.Random(0)
+    pages = [make_page(p, page_size, rng) for p in range(n_pages)]
+    app = load_app_functions('SENTIMENT_FIELDS', 'sentiment_value', 'normalize_article')
+    normalize_article = app['normalize_article']
+
+    def baseline(content):
+        # What requests' response.json() did before the orjson change
+        return json.loads(content).get("results", [])
+
+    def shipped(content):
+        return [normalize_article(r) for r in orjson.loads(content).get("results") or []]
+
+    print(f"{n_pages} pages x {page_size} articles, {sum(map(len, pages)) / 2 ** 20:.1f} MB of JSON")
+    for label, decode in (("baseline json", baseline), ("orjson + normalize", shipped)):
+        elapsed, peak, count = run(decode, pages)
+        print(f"{label:>20}: {elapsed:.3f} s, peak {peak:.1f} MB, {count:,} articles")
+
+
+if __name__ == "__main__":
+    main()